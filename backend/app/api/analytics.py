@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
 
@@ -12,12 +12,12 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
 @router.get("/aggregated", response_model=AggregatedData)
-def get_aggregated_data(
+async def get_aggregated_data(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     severity: Optional[SeverityEnum] = None,
     source: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get aggregated log data
@@ -31,24 +31,24 @@ def get_aggregated_data(
     - **severity**: Filter by severity level
     - **source**: Filter by source
     """
-    data = log_crud.get_aggregated_data(
+    data = await log_crud.get_aggregated_data(
         db,
         start_date=start_date,
         end_date=end_date,
         severity=severity,
         source=source
     )
-    return AggregatedData(**data)
+    return AggregatedData.model_construct(**data)
 
 
 @router.get("/trend", response_model=TrendData)
-def get_trend_data(
+async def get_trend_data(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     severity: Optional[SeverityEnum] = None,
     source: Optional[str] = None,
     interval: str = Query("hour", description="Time interval: hour or day"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get time series trend data for charts
@@ -63,7 +63,7 @@ def get_trend_data(
     - **source**: Filter by source
     - **interval**: Time bucket interval (hour or day)
     """
-    data_points = log_crud.get_trend_data(
+    data_points = await log_crud.get_trend_data(
         db,
         start_date=start_date,
         end_date=end_date,
@@ -72,16 +72,17 @@ def get_trend_data(
         interval=interval
     )
 
-    trend_points = [TrendDataPoint(**point) for point in data_points]
-    return TrendData(data_points=trend_points)
+    # The CRUD layer already returns typed values, so skip re-validation
+    trend_points = [TrendDataPoint.model_construct(**point) for point in data_points]
+    return TrendData.model_construct(data_points=trend_points)
 
 
 @router.get("/distribution", response_model=DistributionData)
-def get_distribution_data(
+async def get_distribution_data(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     source: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get severity distribution data for histogram/pie charts
@@ -94,7 +95,7 @@ def get_distribution_data(
     - **end_date**: Filter logs before this date
     - **source**: Filter by source
     """
-    aggregated = log_crud.get_aggregated_data(
+    distribution = await log_crud.get_severity_distribution(
         db,
         start_date=start_date,
         end_date=end_date,
@@ -102,8 +103,8 @@ def get_distribution_data(
     )
 
     items = [
-        DistributionItem(label=severity, count=count)
-        for severity, count in aggregated["by_severity"].items()
+        DistributionItem.model_construct(label=severity, count=count)
+        for severity, count in distribution
     ]
 
-    return DistributionData(items=items)
+    return DistributionData.model_construct(items=items)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_db, require_user
 from app.core.security import create_access_token
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user
 
@@ -19,7 +19,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     - **name**: optional user name
     """
     # Check if user exists
-    db_user = user_crud.get_user_by_email(db, email=user.email)
+    db_user = await user_crud.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -27,18 +27,18 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Create user
-    new_user = user_crud.create_user(db, user)
+    new_user = await user_crud.create_user(db, user)
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """
     Login with email and password
 
     Returns JWT access token
     """
-    user = user_crud.authenticate_user(db, user_credentials.email, user_credentials.password)
+    user = await user_crud.authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,7 +52,7 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=User)
-def get_current_user_info(current_user: User = Depends(require_user)):
+async def get_current_user_info(current_user: User = Depends(require_user)):
     """
     Get current user information (requires authentication)
     """
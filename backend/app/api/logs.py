@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
 from typing import Optional
 from datetime import datetime
-import math
+import csv
+import orjson
 
 from app.core.dependencies import get_db, require_user, get_current_user
+from app.database import AsyncSessionLocal
 from app.crud import log as log_crud
 from app.schemas.log import Log, LogCreate, LogUpdate, LogList, LogFilter
 from app.models.log import SeverityEnum
@@ -12,9 +17,29 @@ from app.models.user import User
 
 router = APIRouter(prefix="/logs", tags=["logs"])
 
+CSV_HEADER = ["id", "timestamp", "severity", "source", "message"]
+
+
+def build_filter(**params) -> LogFilter:
+    """Build a LogFilter from query params, reporting invalid values as a 422 like FastAPI does"""
+    try:
+        return LogFilter(**params)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("query", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+
+
+class Echo:
+    """File-like object that returns what is written instead of buffering it"""
+
+    def write(self, value):
+        return value
+
 
 @router.get("", response_model=LogList)
-def get_logs(
+async def get_logs(
     severity: Optional[SeverityEnum] = None,
     source: Optional[str] = None,
     start_date: Optional[datetime] = None,
@@ -24,7 +49,9 @@ def get_logs(
     sort_order: str = "desc",
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get list of logs with filtering, search, sorting, and pagination
@@ -36,12 +63,22 @@ def get_logs(
     - **start_date**: Filter logs after this date
     - **end_date**: Filter logs before this date
     - **search**: Full-text search in log messages
-    - **sort_by**: Field to sort by (default: timestamp)
+    - **sort_by**: Field to sort by: timestamp, severity, source or id (default: timestamp)
     - **sort_order**: asc or desc (default: desc)
     - **page**: Page number (default: 1)
     - **page_size**: Items per page (default: 50, max: 100)
+    - **cursor**: Keyset cursor (`next_cursor` of the previous page); replaces `page`
+      and is only supported when sorting by timestamp
+    - **include_total**: Count matching logs for `total` and `total_pages` (default: true).
+      Turn off when `has_next` is enough to skip the count
     """
-    filter_params = LogFilter(
+    if cursor and sort_by != "timestamp":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination requires sort_by=timestamp"
+        )
+
+    filter_params = build_filter(
         severity=severity,
         source=source,
         start_date=start_date,
@@ -50,29 +87,115 @@ def get_logs(
         sort_by=sort_by,
         sort_order=sort_order,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total
     )
 
-    logs, total = log_crud.get_logs(db, filter_params)
-    total_pages = math.ceil(total / page_size)
+    try:
+        logs, total, total_is_estimate, has_next = await log_crud.get_logs(db, filter_params)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    total_pages = None
+    if total is not None:
+        total_pages = (total + page_size - 1) // page_size
+
+    # Only timestamp ordering has a stable (timestamp, id) position to resume from
+    next_cursor = None
+    if sort_by == "timestamp" and has_next:
+        next_cursor = log_crud.encode_cursor(logs[-1]["timestamp"], logs[-1]["id"])
 
-    return LogList(
-        items=logs,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
+    # Rows come straight from the database, so they are serialized without
+    # validating each item against the Log schema; LogList documents the shape
+    return ORJSONResponse({
+        "items": logs,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "has_next": has_next,
+        "next_cursor": next_cursor
+    })
+
+
+@router.get("/export")
+async def export_logs(
+    severity: Optional[SeverityEnum] = None,
+    source: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    search: Optional[str] = None,
+    sort_by: str = "timestamp",
+    sort_order: str = "desc",
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+):
+    """
+    Export all logs matching the filters as CSV or NDJSON
+
+    **Public endpoint** - No authentication required
+
+    - **format**: `csv` (default) or `ndjson`, one JSON object per line
+
+    Rows are streamed to the client as they are read from the database,
+    so the export is not capped and memory usage stays constant.
+    """
+    filter_params = build_filter(
+        severity=severity,
+        source=source,
+        start_date=start_date,
+        end_date=end_date,
+        search=search,
+        sort_by=sort_by,
+        sort_order=sort_order
+    )
+
+    async def csv_rows():
+        writer = csv.writer(Echo())
+        yield writer.writerow(CSV_HEADER)
+
+        # The request-scoped session is closed before the body is streamed,
+        # so the generator owns its own session
+        async with AsyncSessionLocal() as db:
+            async for log in log_crud.iter_logs(db, filter_params):
+                yield writer.writerow([
+                    log["id"],
+                    log["timestamp"].isoformat(),
+                    log["severity"].value,
+                    log["source"],
+                    log["message"]
+                ])
+
+    async def ndjson_rows():
+        async with AsyncSessionLocal() as db:
+            async for log in log_crud.iter_logs(db, filter_params):
+                yield orjson.dumps(log) + b"\n"
+
+    if export_format == "ndjson":
+        return StreamingResponse(
+            ndjson_rows(),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=logs.ndjson"}
+        )
+
+    return StreamingResponse(
+        csv_rows(),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=logs.csv"}
     )
 
 
 @router.get("/{log_id}", response_model=Log)
-def get_log(log_id: str, db: Session = Depends(get_db)):
+async def get_log(log_id: str, db: AsyncSession = Depends(get_db)):
     """
     Get a single log by ID
 
     **Public endpoint** - No authentication required
     """
-    log = log_crud.get_log(db, log_id)
+    log = await log_crud.get_log(db, log_id)
     if not log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,32 +205,32 @@ def get_log(log_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("", response_model=Log, status_code=status.HTTP_201_CREATED)
-def create_log(
+async def create_log(
     log: LogCreate,
     current_user: User = Depends(require_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new log entry
 
     **Requires authentication**
     """
-    return log_crud.create_log(db, log)
+    return await log_crud.create_log(db, log)
 
 
 @router.put("/{log_id}", response_model=Log)
-def update_log(
+async def update_log(
     log_id: str,
     log_update: LogUpdate,
     current_user: User = Depends(require_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an existing log
 
     **Requires authentication**
     """
-    updated_log = log_crud.update_log(db, log_id, log_update)
+    updated_log = await log_crud.update_log(db, log_id, log_update)
     if not updated_log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,17 +240,17 @@ def update_log(
 
 
 @router.delete("/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_log(
+async def delete_log(
     log_id: str,
     current_user: User = Depends(require_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a log entry
 
     **Requires authentication**
     """
-    success = log_crud.delete_log(db, log_id)
+    success = await log_crud.delete_log(db, log_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
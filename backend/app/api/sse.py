@@ -1,45 +1,67 @@
 from fastapi import APIRouter, Query
 from fastapi.responses import StreamingResponse
 from typing import Optional, AsyncGenerator
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncio
-import json
+import orjson
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
+from app.core.broker import broker
 from app.crud import log as log_crud
 from app.models.log import SeverityEnum
-from app.schemas.analytics import AggregatedData, TrendData, DistributionData, TrendDataPoint, DistributionItem
+from app.schemas.log import LogFilter
 
+router = APIRouter(prefix="/sse", tags=["sse"])
 
-def json_serializer(obj):
-    """JSON serializer for objects not serializable by default json code"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f"Type {type(obj)} not serializable")
+EPOCH = datetime(1970, 1, 1)
+
+# SSE comment sent instead of a data frame when nothing changed since the last tick
+KEEP_ALIVE = b": keep-alive\n\n"
 
-router = APIRouter(prefix="/sse", tags=["sse"])
+
+def floor_to_interval(value: datetime, interval: int) -> datetime:
+    """Round a naive UTC datetime down to a multiple of `interval` seconds"""
+    elapsed = int((value - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=elapsed - elapsed % interval)
 
 
 async def event_generator(
     data_fetcher,
+    cache_key: tuple,
     interval: int = 5
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Generic SSE event generator
 
+    Clients with the same cache key and interval subscribe to one broker
+    channel, so the data is fetched and serialized once per tick for all of them.
+    A data frame is only sent when the data changed; otherwise a keep-alive comment.
+
     Args:
-        data_fetcher: Function to fetch data
+        data_fetcher: Async function taking the snapped window end and fetching data
+        cache_key: Query name and filters identifying the data
         interval: Update interval in seconds
     """
-    try:
-        while True:
-            data = data_fetcher()
+    last_data = None
+
+    async def fetch_event():
+        nonlocal last_data
+        # Snap the window end to the bucket start so open-ended queries from
+        # every tick in a bucket are identical and hit the analytics cache
+        data = await data_fetcher(floor_to_interval(datetime.utcnow(), interval))
+        if data == last_data:
+            return KEEP_ALIVE
+        last_data = data
 
-            # Format as SSE event
-            yield f"data: {json.dumps(data, default=json_serializer)}\n\n"
+        # Format as SSE event, orjson serializes datetimes natively
+        payload = orjson.dumps({**data, "timestamp": datetime.utcnow()})
+        return b"data: " + payload + b"\n\n"
 
-            # Wait before next update
-            await asyncio.sleep(interval)
+    try:
+        async for event in broker.subscribe(
+            (*cache_key, interval), fetch_event, interval, heartbeat=KEEP_ALIVE
+        ):
+            yield event
     except asyncio.CancelledError:
         # Client disconnected
         pass
@@ -60,27 +82,22 @@ async def stream_logs_count(
 
     Sends updates every `interval` seconds with the current count
     """
-    def fetch_count():
-        from app.crud.log import get_logs
-        from app.schemas.log import LogFilter
-
-        db = SessionLocal()
-        try:
+    async def fetch_count(window_end: datetime):
+        async with AsyncSessionLocal() as db:
             filter_params = LogFilter(
                 severity=severity,
                 source=source,
                 start_date=start_date,
-                end_date=end_date,
-                page=1,
-                page_size=1
+                end_date=end_date or window_end
             )
-            _, total = get_logs(db, filter_params)
-            return {"count": total, "timestamp": datetime.utcnow().isoformat()}
-        finally:
-            db.close()
+            # The client diffs consecutive counts, so never use the planner estimate
+            total, _ = await log_crud.count_logs(db, filter_params, allow_estimate=False)
+            return {"count": total}
 
     return StreamingResponse(
-        event_generator(fetch_count, interval),
+        event_generator(
+            fetch_count, ("count", severity, source, start_date, end_date), interval
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -105,24 +122,22 @@ async def stream_aggregated_analytics(
 
     Sends updates every `interval` seconds with current aggregated data
     """
-    def fetch_aggregated():
-        db = SessionLocal()
-        try:
-            data = log_crud.get_aggregated_data(
+    async def fetch_aggregated(window_end: datetime):
+        async with AsyncSessionLocal() as db:
+            data = await log_crud.get_aggregated_data(
                 db,
                 start_date=start_date,
-                end_date=end_date,
+                end_date=end_date or window_end,
                 severity=severity,
                 source=source
             )
-            result = AggregatedData(**data).model_dump()
-            result["timestamp"] = datetime.utcnow().isoformat()
-            return result
-        finally:
-            db.close()
+            # SSE has no response model to enforce, so skip the Pydantic round-trip
+            return data
 
     return StreamingResponse(
-        event_generator(fetch_aggregated, interval),
+        event_generator(
+            fetch_aggregated, ("aggregated", start_date, end_date, severity, source), interval
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -148,26 +163,24 @@ async def stream_trend_analytics(
 
     Sends updates every `update_interval` seconds with current trend data
     """
-    def fetch_trend():
-        db = SessionLocal()
-        try:
-            data_points = log_crud.get_trend_data(
+    async def fetch_trend(window_end: datetime):
+        async with AsyncSessionLocal() as db:
+            data_points = await log_crud.get_trend_data(
                 db,
                 start_date=start_date,
-                end_date=end_date,
+                end_date=end_date or window_end,
                 severity=severity,
                 source=source,
                 interval=trend_interval
             )
-            trend_points = [TrendDataPoint(**point) for point in data_points]
-            result = TrendData(data_points=trend_points).model_dump()
-            result["timestamp"] = datetime.utcnow().isoformat()
-            return result
-        finally:
-            db.close()
+            return {"data_points": data_points}
 
     return StreamingResponse(
-        event_generator(fetch_trend, update_interval),
+        event_generator(
+            fetch_trend,
+            ("trend", start_date, end_date, severity, source, trend_interval),
+            update_interval
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -191,27 +204,25 @@ async def stream_distribution_analytics(
 
     Sends updates every `interval` seconds with current distribution data
     """
-    def fetch_distribution():
-        db = SessionLocal()
-        try:
-            aggregated = log_crud.get_aggregated_data(
+    async def fetch_distribution(window_end: datetime):
+        async with AsyncSessionLocal() as db:
+            distribution = await log_crud.get_severity_distribution(
                 db,
                 start_date=start_date,
-                end_date=end_date,
+                end_date=end_date or window_end,
                 source=source
             )
-            items = [
-                DistributionItem(label=severity, count=count)
-                for severity, count in aggregated["by_severity"].items()
-            ]
-            result = DistributionData(items=items).model_dump()
-            result["timestamp"] = datetime.utcnow().isoformat()
-            return result
-        finally:
-            db.close()
+            return {
+                "items": [
+                    {"label": severity, "count": count}
+                    for severity, count in distribution
+                ]
+            }
 
     return StreamingResponse(
-        event_generator(fetch_distribution, interval),
+        event_generator(
+            fetch_distribution, ("distribution", start_date, end_date, source), interval
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
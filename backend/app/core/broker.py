@@ -0,0 +1,92 @@
+"""
+In-process pub/sub broker for SSE streams
+Runs one polling loop per distinct stream key and fans each message out to every subscriber
+"""
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+
+class Channel:
+    """Polling loop for one stream key and the queues of its subscribers"""
+
+    def __init__(self, fetch: Callable[[], Awaitable[Any]], interval: int, heartbeat: Optional[Any] = None):
+        self.fetch = fetch
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.latest: Optional[Any] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def publish(self, message: Any):
+        """
+        Send a message to every subscriber. Each queue holds one message, so a
+        slow client only ever receives the newest frame instead of a backlog.
+        """
+        for queue in self.subscribers:
+            if queue.full():
+                # A pending frame is still current when nothing changed
+                if message == self.heartbeat:
+                    continue
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def run(self):
+        """Fetch and broadcast every `interval` seconds until cancelled"""
+        while True:
+            try:
+                message = await self.fetch()
+            except Exception as e:
+                # Hand the error to the subscribers so each stream fails like it would on its own
+                self.publish(e)
+                return
+            # Heartbeats are not replayed to late subscribers
+            if message != self.heartbeat:
+                self.latest = message
+            self.publish(message)
+            await asyncio.sleep(self.interval)
+
+
+class Broker:
+    """Registry of channels keyed by endpoint and filters"""
+
+    def __init__(self):
+        self.channels: Dict[Hashable, Channel] = {}
+
+    async def subscribe(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        interval: int,
+        heartbeat: Optional[Any] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the messages of the channel for `key`, starting its polling loop
+        if this is the first subscriber. The channel stops once the last
+        subscriber leaves. `fetch` may return `heartbeat` when it has nothing new.
+        """
+        channel = self.channels.get(key)
+        if channel is None or channel.task.done():
+            channel = Channel(fetch, interval, heartbeat)
+            channel.task = asyncio.create_task(channel.run())
+            self.channels[key] = channel
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        channel.subscribers.add(queue)
+        # Late subscribers get the current value right away instead of waiting a full interval
+        if channel.latest is not None:
+            queue.put_nowait(channel.latest)
+
+        try:
+            while True:
+                message = await queue.get()
+                if isinstance(message, Exception):
+                    raise message
+                yield message
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers and self.channels.get(key) is channel:
+                channel.task.cancel()
+                del self.channels[key]
+
+
+broker = Broker()
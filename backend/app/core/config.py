@@ -1,15 +1,22 @@
-from pydantic_settings import BaseSettings
-from typing import List
-import json
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Union
+import orjson
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
     # API
     API_V1_STR: str = "/api"
     PROJECT_NAME: str = "Logs Dashboard API"
+    # Development checks, e.g. raising on lazy relationship loads
+    DEBUG: bool = False
 
     # Database
     DATABASE_URL: str
+    # Set when connecting through PgBouncer in transaction mode, which does the pooling instead
+    DATABASE_NULL_POOL: bool = False
 
     # JWT
     SECRET_KEY: str
@@ -17,17 +24,18 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
 
     # CORS
-    BACKEND_CORS_ORIGINS: List[str] = ["http://localhost", "http://localhost:5173"]
-
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-
-        @classmethod
-        def parse_env_var(cls, field_name: str, raw_val: str):
-            if field_name == 'BACKEND_CORS_ORIGINS':
-                return json.loads(raw_val)
-            return raw_val
+    # The str member lets a comma-separated value reach the validator instead of failing JSON decoding
+    BACKEND_CORS_ORIGINS: Union[List[str], str] = ["http://localhost", "http://localhost:5173"]
+
+    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @classmethod
+    def parse_cors_origins(cls, value):
+        """Accept a JSON array or a comma-separated list of origins"""
+        if isinstance(value, str):
+            if value.lstrip().startswith("["):
+                return orjson.loads(value)
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
 
 
 settings = Settings()
@@ -1,30 +1,53 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional, Tuple
+from functools import lru_cache
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+import jwt
+from jwt import PyJWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.core.config import settings
 from app.crud import user as user_crud
 from app.models.user import User
 
 security = HTTPBearer(auto_error=False)
 
+# Users by ID, so repeated requests with the same token skip the SELECT
+_user_cache = TTLCache(maxsize=4096, ttl=30)
 
-def get_db() -> Generator:
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Database session dependency"""
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> Optional[Tuple[str, Optional[int]]]:
+    """
+    Verify a JWT once and return (user_id, exp).
+    Returns None if the token is invalid or has no subject.
+    """
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except PyJWTError:
+        return None
+
+    user_id = payload.get("sub")
+    if user_id is None:
+        return None
+    return user_id, payload.get("exp")
+
+
+async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """
     Get current user from JWT token.
@@ -33,22 +56,24 @@ def get_current_user(
     if credentials is None:
         return None
 
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-    except JWTError:
+    claims = _decode_token(credentials.credentials)
+    if claims is None:
+        return None
+
+    # Decoded tokens are cached, so expiry has to be re-checked on every use
+    user_id, exp = claims
+    if exp is not None and exp < time.time():
         return None
 
-    user = user_crud.get_user_by_id(db, user_id=user_id)
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await user_crud.get_user_by_id(db, user_id=user_id)
+        if user is not None:
+            _user_cache[user_id] = user
     return user
 
 
-def require_user(
+async def require_user(
     current_user: Optional[User] = Depends(get_current_user)
 ) -> User:
     """
@@ -1,146 +1,451 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, desc, asc
-from app.models.log import Log, SeverityEnum
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, func, or_, and_, desc, asc, tuple_, text, literal_column
+from cachetools import TTLCache
+from app.database import select_entity
+from app.models.log import Log, LogHourly, SeverityEnum
 from app.schemas.log import LogCreate, LogUpdate, LogFilter
-from typing import List, Tuple, Optional
-from datetime import datetime
-
-
-def create_log(db: Session, log: LogCreate) -> Log:
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple, Optional
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+import asyncio
+import base64
+
+# Exact counts per filter combination, shared across requests for a few seconds
+_count_cache = TTLCache(maxsize=1024, ttl=10)
+
+# Analytics results per query and filters. Dashboards poll the same filters
+# from many clients, so one query serves all of them for a few seconds.
+_analytics_cache = TTLCache(maxsize=512, ttl=10)
+# One lock per key being computed, so concurrent misses run the query once
+_analytics_locks: Dict[tuple, asyncio.Lock] = {}
+
+# Base statement for exact counts, built once at import. Filters are appended
+# per call; the compiled SQL is cached on the statement structure, so bound
+# values don't cause recompilation.
+_TOTAL_COUNT = select(func.count(Log.id))
+
+# Columns of a log as returned by the list endpoint. Pages are read as plain
+# rows, which skips loading ORM objects and lets them be serialized directly.
+_LIST_COLUMNS = (Log.id, Log.timestamp, Log.message, Log.severity, Log.source, Log.created_at, Log.updated_at)
+
+# Columns for LogFilter.sort_by (validated against SORT_FIELDS)
+_SORT_COLUMNS = {
+    "timestamp": Log.timestamp,
+    "severity": Log.severity,
+    "source": Log.source,
+    "id": Log.id,
+}
+
+
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC and asyncpg rejects aware values for them"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def _cached_analytics(key: tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached result for `key`, or compute and cache it
+    Concurrent callers with the same key wait for the first one instead of
+    running the same query in parallel.
+    """
+    if key in _analytics_cache:
+        return _analytics_cache[key]
+
+    lock = _analytics_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            if key in _analytics_cache:
+                return _analytics_cache[key]
+            result = await compute()
+            _analytics_cache[key] = result
+            return result
+    finally:
+        # Waiters still hold the lock object; later callers find the cached result
+        if _analytics_locks.get(key) is lock:
+            del _analytics_locks[key]
+
+
+async def create_log(db: AsyncSession, log: LogCreate) -> Log:
     """Create a new log entry"""
-    db_log = Log(
-        message=log.message,
-        severity=log.severity,
-        source=log.source,
-        timestamp=log.timestamp or datetime.utcnow()
-    )
-    db.add(db_log)
-    db.commit()
-    db.refresh(db_log)
+    values = {"message": log.message, "severity": log.severity, "source": log.source}
+    # Without a timestamp the database default (now, in UTC) applies
+    if log.timestamp:
+        values["timestamp"] = _as_naive_utc(log.timestamp)
+
+    # RETURNING loads the stored row, including server defaults, in the same roundtrip as the INSERT
+    result = await db.scalars(insert(Log).values(**values).returning(Log))
+    db_log = result.one()
+    await db.commit()
+    _analytics_cache.clear()
+    _count_cache.clear()
     return db_log
 
 
-def get_log(db: Session, log_id: str) -> Optional[Log]:
-    """Get a single log by ID"""
-    return db.query(Log).filter(Log.id == log_id).first()
+def encode_cursor(timestamp: datetime, log_id: UUID) -> str:
+    """Encode the keyset position of a log as an opaque cursor"""
+    raw = f"{timestamp.isoformat()}|{log_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
 
-def get_logs(db: Session, filter_params: LogFilter) -> Tuple[List[Log], int]:
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
     """
-    Get logs with filtering, searching, sorting, and pagination
-    Returns tuple of (logs, total_count)
+    Decode a cursor produced by encode_cursor
+    Raises ValueError if the cursor is malformed
     """
-    query = db.query(Log)
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, log_id = raw.split("|")
+        # A hand-made cursor may carry an offset; compare it as naive UTC
+        return _as_naive_utc(datetime.fromisoformat(timestamp)), UUID(log_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def get_log(db: AsyncSession, log_id: str) -> Optional[Log]:
+    """Get a single log by ID"""
+    result = await db.execute(select_entity(Log).where(Log.id == log_id))
+    return result.scalars().first()
+
+
+def _like_pattern(search: str) -> str:
+    """Turn a search with * wildcards into an ILIKE pattern matching anywhere in the message"""
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped.replace('*', '%')}%"
+
+
+def _filter_conditions(filter_params: LogFilter) -> list:
+    """Build the WHERE conditions for the filter and search params"""
+    conditions = []
 
     # Apply filters
     if filter_params.severity:
-        query = query.filter(Log.severity == filter_params.severity)
+        conditions.append(Log.severity == filter_params.severity)
 
     if filter_params.source:
-        query = query.filter(Log.source == filter_params.source)
+        conditions.append(Log.source == filter_params.source)
 
     if filter_params.start_date:
-        query = query.filter(Log.timestamp >= filter_params.start_date)
+        conditions.append(Log.timestamp >= _as_naive_utc(filter_params.start_date))
 
     if filter_params.end_date:
-        query = query.filter(Log.timestamp <= filter_params.end_date)
+        conditions.append(Log.timestamp <= _as_naive_utc(filter_params.end_date))
 
-    # Full-text search
     if filter_params.search:
-        search_term = f"%{filter_params.search}%"
-        query = query.filter(Log.message.ilike(search_term))
+        if "*" in filter_params.search:
+            # Substring search with * wildcards, served by the trigram index
+            conditions.append(Log.message.ilike(_like_pattern(filter_params.search), escape="\\"))
+        else:
+            # Whole-word search against the GIN-indexed tsvector column
+            query = func.websearch_to_tsquery('english', filter_params.search)
+            conditions.append(Log.search_vector.op('@@')(query))
+
+    return conditions
+
+
+def _apply_sorting(stmt, filter_params: LogFilter):
+    """Order a logs statement by the requested column and direction"""
+    sort_column = _SORT_COLUMNS.get(filter_params.sort_by, Log.timestamp)
+    columns = [sort_column]
+    if sort_column is Log.timestamp:
+        # Break ties on id like the keyset seek does, so the order of rows
+        # sharing a timestamp is the same across pages and pagination modes
+        columns.append(Log.id)
+    direction = asc if filter_params.sort_order == "asc" else desc
+    return stmt.order_by(*(direction(column) for column in columns))
+
+
+def _filter_key(filter_params: LogFilter) -> tuple:
+    """Cache key of the filters that affect the row count (not pagination or sorting)"""
+    return (
+        filter_params.severity,
+        filter_params.source,
+        filter_params.start_date,
+        filter_params.end_date,
+        filter_params.search
+    )
+
+
+async def _known_total(db: AsyncSession, filter_params: LogFilter, allow_estimate: bool) -> Optional[Tuple[int, bool]]:
+    """
+    Total from the planner estimate or the count cache, without counting rows
+    Returns None if neither can answer
+    """
+    key = _filter_key(filter_params)
+
+    if allow_estimate and not any(value is not None for value in key):
+        # logs is partitioned, so the estimate is the sum over its partitions
+        estimate = await db.scalar(text("""
+            SELECT sum(c.reltuples)::bigint FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'logs'::regclass AND c.reltuples > 0
+        """))
+        # reltuples is 0 or -1 until a partition has been analyzed
+        if estimate and estimate > 0:
+            return estimate, True
+
+    total = _count_cache.get(key)
+    if total is not None:
+        return total, False
+    return None
+
+
+async def count_logs(db: AsyncSession, filter_params: LogFilter, allow_estimate: bool = True) -> Tuple[int, bool]:
+    """
+    Count logs matching the filters
+    Returns tuple of (count, is_estimate)
+
+    Without filters the planner's row estimate is used when `allow_estimate`
+    is set; otherwise exact counts are cached per filter combination.
+    """
+    known = await _known_total(db, filter_params, allow_estimate)
+    if known is not None:
+        return known
+
+    total = await db.scalar(
+        _TOTAL_COUNT.where(*_filter_conditions(filter_params))
+    )
+    _count_cache[_filter_key(filter_params)] = total
+    return total, False
 
-    # Get total count before pagination
-    total = query.count()
+
+def _as_dicts(rows) -> List[dict]:
+    """Map rows starting with _LIST_COLUMNS to dicts, dropping any extra columns"""
+    keys = [column.key for column in _LIST_COLUMNS]
+    logs = []
+    for row in rows:
+        log = dict(zip(keys, row))
+        # asyncpg returns its own UUID subclass, which orjson refuses to serialize
+        log["id"] = UUID(bytes=log["id"].bytes)
+        logs.append(log)
+    return logs
+
+
+async def get_logs(db: AsyncSession, filter_params: LogFilter) -> Tuple[List[dict], Optional[int], bool, bool]:
+    """
+    Get logs with filtering, searching, sorting, and pagination
+    Returns tuple of (logs as dicts, total_count, total_is_estimate, has_next)
+
+    One row past the page is fetched to tell whether another page follows.
+    The total is None when `include_total` is off.
+    """
+    page_size = filter_params.page_size
+    stmt = select(*_LIST_COLUMNS).where(*_filter_conditions(filter_params))
+
+    if filter_params.cursor:
+        # The cursor predicate narrows the scan, so the total has to be counted separately
+        total, total_is_estimate = None, False
+        if filter_params.include_total:
+            total, total_is_estimate = await count_logs(db, filter_params)
+
+        # Keyset pagination: seek past the cursor instead of scanning an OFFSET
+        timestamp, log_id = decode_cursor(filter_params.cursor)
+        position = tuple_(Log.timestamp, Log.id)
+        if filter_params.sort_order == "asc":
+            stmt = stmt.where(position > tuple_(timestamp, log_id))
+        else:
+            stmt = stmt.where(position < tuple_(timestamp, log_id))
+        result = await db.execute(_apply_sorting(stmt, filter_params).limit(page_size + 1))
+        rows = result.all()
+        return _as_dicts(rows[:page_size]), total, total_is_estimate, len(rows) > page_size
 
     # Sorting
-    sort_column = getattr(Log, filter_params.sort_by, Log.timestamp)
-    if filter_params.sort_order == "asc":
-        query = query.order_by(asc(sort_column))
-    else:
-        query = query.order_by(desc(sort_column))
+    stmt = _apply_sorting(stmt, filter_params)
 
     # Pagination
-    offset = (filter_params.page - 1) * filter_params.page_size
-    logs = query.offset(offset).limit(filter_params.page_size).all()
+    offset = (filter_params.page - 1) * page_size
+    stmt = stmt.offset(offset).limit(page_size + 1)
 
-    return logs, total
+    if filter_params.include_total:
+        known = await _known_total(db, filter_params, allow_estimate=True)
+    else:
+        known = None, False
+    if known is not None:
+        result = await db.execute(stmt)
+        rows = result.all()
+        return _as_dicts(rows[:page_size]), *known, len(rows) > page_size
+
+    # Count the filtered set in the same scan that produces the page
+    result = await db.execute(stmt.add_columns(func.count().over().label('total')))
+    rows = result.all()
+    if rows:
+        total = rows[0].total
+        _count_cache[_filter_key(filter_params)] = total
+        return _as_dicts(rows[:page_size]), total, False, len(rows) > page_size
+
+    # An empty first page means nothing matches at all
+    if offset == 0:
+        _count_cache[_filter_key(filter_params)] = 0
+        return [], 0, False, False
+
+    # Past the last page there is no row to carry the window count
+    total, _ = await count_logs(db, filter_params)
+    return [], total, False, False
+
+
+async def iter_logs(db: AsyncSession, filter_params: LogFilter, batch_size: int = 1000) -> AsyncIterator[dict]:
+    """
+    Iterate over all logs matching the filters as dicts, ignoring pagination.
+    Rows are fetched through a server-side cursor in batches of `batch_size`
+    so memory stays bounded regardless of the result size.
+    """
+    stmt = _apply_sorting(select(*_LIST_COLUMNS).where(*_filter_conditions(filter_params)), filter_params)
+    result = await db.stream(stmt.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        for log in _as_dicts(rows):
+            yield log
 
 
-def update_log(db: Session, log_id: str, log_update: LogUpdate) -> Optional[Log]:
+async def update_log(db: AsyncSession, log_id: str, log_update: LogUpdate) -> Optional[Log]:
     """Update a log entry"""
-    db_log = get_log(db, log_id)
-    if not db_log:
-        return None
-
     update_data = log_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_log, key, value)
-
-    db.commit()
-    db.refresh(db_log)
+    if not update_data:
+        return await get_log(db, log_id)
+    if "timestamp" in update_data:
+        update_data["timestamp"] = _as_naive_utc(update_data["timestamp"])
+
+    # RETURNING loads the updated row in the same roundtrip as the UPDATE
+    result = await db.scalars(
+        update(Log).where(Log.id == log_id).values(**update_data).returning(Log)
+    )
+    db_log = result.one_or_none()
+    await db.commit()
+    _analytics_cache.clear()
+    _count_cache.clear()
     return db_log
 
 
-def delete_log(db: Session, log_id: str) -> bool:
+async def delete_log(db: AsyncSession, log_id: str) -> bool:
     """Delete a log entry"""
-    db_log = get_log(db, log_id)
+    db_log = await get_log(db, log_id)
     if not db_log:
         return False
 
-    db.delete(db_log)
-    db.commit()
+    await db.delete(db_log)
+    await db.commit()
+    _analytics_cache.clear()
+    _count_cache.clear()
     return True
 
 
-def get_aggregated_data(
-    db: Session,
+def _range_conditions(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     severity: Optional[SeverityEnum] = None,
     source: Optional[str] = None
-) -> dict:
-    """Get aggregated log data"""
-    query = db.query(Log)
+) -> list:
+    """Build the WHERE conditions shared by the analytics queries"""
+    conditions = []
+    if start_date:
+        conditions.append(Log.timestamp >= _as_naive_utc(start_date))
+    if end_date:
+        conditions.append(Log.timestamp <= _as_naive_utc(end_date))
+    if severity:
+        conditions.append(Log.severity == severity)
+    if source:
+        conditions.append(Log.source == source)
+    return conditions
+
+
+def _hourly_counts(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    severity: Optional[SeverityEnum] = None,
+    source: Optional[str] = None
+):
+    """
+    Log counts per hour, severity and source within the range, as a CTE with
+    columns (hour, severity, source, n).
+    Whole hours are read from the logs_hourly rollup; the partial hours at the
+    edges of the range are counted from logs so the result stays exact.
+    """
+    start_date, end_date = _as_naive_utc(start_date), _as_naive_utc(end_date)
+
+    rollup_conditions = []
+    raw_ranges = []
 
-    # Apply filters
     if start_date:
-        query = query.filter(Log.timestamp >= start_date)
+        first_hour = start_date.replace(minute=0, second=0, microsecond=0)
+        if first_hour < start_date:
+            first_hour += timedelta(hours=1)
+        rollup_conditions.append(LogHourly.hour >= first_hour)
     if end_date:
-        query = query.filter(Log.timestamp <= end_date)
+        last_hour = end_date.replace(minute=0, second=0, microsecond=0)
+        rollup_conditions.append(LogHourly.hour < last_hour)
+
+    if start_date and end_date and first_hour > last_hour:
+        # Start and end fall within the same hour
+        raw_ranges.append(and_(Log.timestamp >= start_date, Log.timestamp <= end_date))
+    else:
+        if start_date and first_hour > start_date:
+            raw_ranges.append(and_(Log.timestamp >= start_date, Log.timestamp < first_hour))
+        if end_date:
+            raw_ranges.append(and_(Log.timestamp >= last_hour, Log.timestamp <= end_date))
+
     if severity:
-        query = query.filter(Log.severity == severity)
+        rollup_conditions.append(LogHourly.severity == severity)
     if source:
-        query = query.filter(Log.source == source)
-
-    # Total logs
-    total_logs = query.count()
-
-    # Count by severity
-    severity_counts = db.query(
-        Log.severity, func.count(Log.id)
-    ).filter(
-        *[condition for condition in [
-            Log.timestamp >= start_date if start_date else None,
-            Log.timestamp <= end_date if end_date else None,
-            Log.source == source if source else None
-        ] if condition is not None]
-    ).group_by(Log.severity).all()
-
-    by_severity = {sev.value: count for sev, count in severity_counts}
-
-    # Count by source
-    source_counts = db.query(
-        Log.source, func.count(Log.id)
-    ).filter(
-        *[condition for condition in [
-            Log.timestamp >= start_date if start_date else None,
-            Log.timestamp <= end_date if end_date else None,
-            Log.severity == severity if severity else None
-        ] if condition is not None]
-    ).group_by(Log.source).all()
-
-    by_source = {source: count for source, count in source_counts}
+        rollup_conditions.append(LogHourly.source == source)
+
+    stmt = select(
+        LogHourly.hour,
+        LogHourly.severity,
+        LogHourly.source,
+        LogHourly.count.label('n')
+    ).where(*rollup_conditions)
+
+    if raw_ranges:
+        # Group on the integer hour_bucket and convert each group back to a timestamp
+        hour = func.timezone('UTC', func.to_timestamp(Log.hour_bucket))
+        stmt = stmt.union_all(
+            select(hour, Log.severity, Log.source, func.count(Log.id))
+            .where(or_(*raw_ranges), *_range_conditions(severity=severity, source=source))
+            .group_by(Log.hour_bucket, Log.severity, Log.source)
+        )
+
+    return stmt.cte('hourly_counts')
+
+
+async def get_aggregated_data(
+    db: AsyncSession,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    severity: Optional[SeverityEnum] = None,
+    source: Optional[str] = None
+) -> dict:
+    """Get aggregated log data"""
+    key = ("aggregated", _as_naive_utc(start_date), _as_naive_utc(end_date), severity, source)
+    return await _cached_analytics(
+        key, lambda: _aggregated_data(db, start_date, end_date, severity, source)
+    )
+
+
+async def _aggregated_data(
+    db: AsyncSession,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    severity: Optional[SeverityEnum],
+    source: Optional[str]
+) -> dict:
+    # Total, per-severity and per-source counts in one pass over the filtered rows
+    counts = _hourly_counts(start_date, end_date, severity, source)
+    results = await db.execute(
+        select(counts.c.severity, counts.c.source, func.sum(counts.c.n))
+        .group_by(func.grouping_sets(counts.c.severity, counts.c.source, literal_column("()")))
+    )
+
+    total_logs = 0
+    by_severity = {}
+    by_source = {}
+    for sev, src, count in results:
+        if sev is not None:
+            by_severity[sev.value] = int(count)
+        elif src is not None:
+            by_source[src] = int(count)
+        else:
+            # The () grand total row is returned even when nothing matches, with a NULL sum
+            total_logs = int(count or 0)
 
     return {
         "total_logs": total_logs,
@@ -149,38 +454,91 @@ def get_aggregated_data(
     }
 
 
-def get_trend_data(
-    db: Session,
+async def get_severity_distribution(
+    db: AsyncSession,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    source: Optional[str] = None
+) -> List[Tuple[str, int]]:
+    """Get log counts per severity as (severity, count) pairs"""
+    key = ("distribution", _as_naive_utc(start_date), _as_naive_utc(end_date), source)
+    return await _cached_analytics(
+        key, lambda: _severity_distribution(db, start_date, end_date, source)
+    )
+
+
+async def _severity_distribution(
+    db: AsyncSession,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    source: Optional[str]
+) -> List[Tuple[str, int]]:
+    counts = _hourly_counts(start_date, end_date, source=source)
+    results = await db.execute(
+        select(counts.c.severity, func.sum(counts.c.n)).group_by(counts.c.severity)
+    )
+
+    return [(severity.value, int(count)) for severity, count in results]
+
+
+async def get_trend_data(
+    db: AsyncSession,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     severity: Optional[SeverityEnum] = None,
     source: Optional[str] = None,
     interval: str = "hour"
 ) -> List[dict]:
-    """Get time series trend data"""
+    """
+    Get time series trend data
+    Buckets without logs are included with a count of 0
+    """
+    start_date, end_date = _as_naive_utc(start_date), _as_naive_utc(end_date)
     # Group by time interval
-    if interval == "hour":
-        time_bucket = func.date_trunc('hour', Log.timestamp)
-    elif interval == "day":
-        time_bucket = func.date_trunc('day', Log.timestamp)
-    else:
-        time_bucket = func.date_trunc('hour', Log.timestamp)
+    unit = "day" if interval == "day" else "hour"
 
-    query = db.query(
-        time_bucket.label('time'),
-        func.count(Log.id).label('count')
+    key = ("trend", start_date, end_date, severity, source, unit)
+    return await _cached_analytics(
+        key, lambda: _trend_data(db, start_date, end_date, severity, source, unit)
     )
 
-    # Apply filters
-    if start_date:
-        query = query.filter(Log.timestamp >= start_date)
-    if end_date:
-        query = query.filter(Log.timestamp <= end_date)
-    if severity:
-        query = query.filter(Log.severity == severity)
-    if source:
-        query = query.filter(Log.source == source)
 
-    results = query.group_by('time').order_by('time').all()
+async def _trend_data(
+    db: AsyncSession,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    severity: Optional[SeverityEnum],
+    source: Optional[str],
+    unit: str
+) -> List[dict]:
+    hourly = _hourly_counts(start_date, end_date, severity, source)
 
-    return [{"timestamp": time, "count": count} for time, count in results]
+    time_bucket = func.date_trunc(unit, hourly.c.hour)
+    counts = select(
+        time_bucket.label('time'),
+        func.sum(hourly.c.n).label('total')
+    ).group_by(time_bucket).subquery()
+
+    # The series spans the first to the last hour with matching logs, which
+    # lie within the requested range; a wide range never yields more buckets
+    # than the data covers. Without matching logs the series is empty.
+    lower = select(func.min(hourly.c.hour)).scalar_subquery()
+    upper = select(func.max(hourly.c.hour)).scalar_subquery()
+    buckets = select(
+        func.generate_series(
+            func.date_trunc(unit, lower),
+            func.date_trunc(unit, upper),
+            literal_column(f"interval '1 {unit}'")
+        ).label('time')
+    ).subquery()
+
+    stmt = select(
+        buckets.c.time,
+        func.coalesce(counts.c.total, 0)
+    ).select_from(
+        buckets.outerjoin(counts, counts.c.time == buckets.c.time)
+    ).order_by(buckets.c.time)
+
+    results = await db.execute(stmt)
+
+    return [{"timestamp": time, "count": int(count)} for time, count in results]
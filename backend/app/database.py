@@ -1,15 +1,72 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, raiseload
+from sqlalchemy.pool import NullPool
+from uuid import uuid4
 
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+# Drop connections the server closed while idle and recycle long-lived ones
+CONNECTION_OPTIONS = {
+    "pool_pre_ping": True,
+    "pool_recycle": 3600,
+}
+
+# Sync engine for the seed and continuous logger scripts
+engine = create_engine(settings.DATABASE_URL, **CONNECTION_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+if settings.DATABASE_NULL_POOL:
+    # PgBouncer multiplexes server connections, so keeping our own pool only
+    # pins them. Prepared statements don't survive switching server
+    # connections, so asyncpg's statement caches are disabled as well, and
+    # the statements asyncpg still prepares get unique names so they can't
+    # collide with another client's on a shared server connection.
+    ASYNC_POOL_OPTIONS = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    # Sized for many concurrent SSE streams next to regular requests; LIFO
+    # keeps the busy connections warm and lets the idle ones time out.
+    # Requests wait up to pool_timeout seconds for a connection before failing.
+    ASYNC_POOL_OPTIONS = {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_timeout": 30,
+        "pool_use_lifo": True,
+        **CONNECTION_OPTIONS,
+    }
+
+# Async engine (asyncpg) for the API so queries never block the event loop
+async_engine = create_async_engine(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    # Room for every filter combination of the list and analytics queries
+    query_cache_size=1200,
+    **ASYNC_POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
+def select_entity(entity):
+    """
+    select() for loading ORM objects
+    With DEBUG set, any lazy load of a relationship raises instead of issuing
+    a query per object; relationships that are used need an explicit selectinload()
+    """
+    stmt = select(entity)
+    if settings.DEBUG:
+        stmt = stmt.options(raiseload('*'))
+    return stmt
+
+
 def init_db():
     """Initialize database tables"""
     import app.models.user  # noqa
@@ -1,4 +1,4 @@
 from app.models.user import User
-from app.models.log import Log, SeverityEnum
+from app.models.log import Log, LogHourly, SeverityEnum
 
-__all__ = ["User", "Log", "SeverityEnum"]
+__all__ = ["User", "Log", "LogHourly", "SeverityEnum"]
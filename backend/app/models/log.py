@@ -1,7 +1,7 @@
-import uuid
 import enum
-from sqlalchemy import Column, String, Text, DateTime, Enum, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, Enum, Index, Computed, BigInteger, DDL, event, func, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred
 from datetime import datetime
 
 from app.database import Base
@@ -15,19 +15,163 @@ class SeverityEnum(str, enum.Enum):
     CRITICAL = "CRITICAL"
 
 
+# Timestamps are stored as naive UTC regardless of the session time zone
+UTC_NOW = text("(now() AT TIME ZONE 'UTC')")
+
+
 class Log(Base):
     __tablename__ = "logs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+    # Defaults are filled in by PostgreSQL, so bulk loads can leave these columns out
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    # Part of the primary key because the table is partitioned on it
+    timestamp = Column(DateTime, primary_key=True, server_default=UTC_NOW, nullable=False)
     message = Column(Text, nullable=False)
-    severity = Column(Enum(SeverityEnum), nullable=False, index=True)
-    source = Column(String, nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    severity = Column(Enum(SeverityEnum), nullable=False)
+    source = Column(String, nullable=False)
+    created_at = Column(DateTime, server_default=UTC_NOW, nullable=False)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=datetime.utcnow, nullable=False)
+    # Maintained by PostgreSQL; deferred so regular queries don't load it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(message, ''))", persisted=True)
+    ))
+    # Epoch seconds of the hour the log falls in, so hourly grouping compares integers
+    hour_bucket = deferred(Column(
+        BigInteger,
+        Computed("extract(epoch from date_trunc('hour', timestamp))::bigint", persisted=True)
+    ))
 
     __table_args__ = (
         # Full-text search index using PostgreSQL pg_trgm extension
         Index('idx_log_message_gin', 'message', postgresql_using='gin',
               postgresql_ops={'message': 'gin_trgm_ops'}),
+        # Full-text search on the stored tsvector
+        Index('idx_log_search_vector', 'search_vector', postgresql_using='gin'),
+        # Keyset pagination on (timestamp, id), scanned backwards for DESC order
+        Index('idx_log_timestamp_id', 'timestamp', 'id'),
+        # Block range index for time range scans over the append-mostly table
+        Index('idx_log_timestamp_brin', 'timestamp', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        Index('idx_log_hour_bucket_brin', 'hour_bucket', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        # Filter by severity or source, ordered by timestamp: the LIMIT stops the
+        # index scan after one page. These also serve plain severity/source lookups.
+        Index('idx_log_severity_timestamp', 'severity', 'timestamp', postgresql_include=['id']),
+        Index('idx_log_source_timestamp', 'source', 'timestamp', postgresql_include=['id']),
+        # Weekly partitions (see PARTITION_DDL); indexes are created on every partition
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
+
+
+# Weekly partitions are named logs_pYYYYMMDD after the Monday they start on.
+# Rows outside every partition land in logs_default. A week is skipped while
+# logs_default holds rows for it, since attaching it would conflict with them.
+# Literal percent signs are doubled for DDL string formatting.
+PARTITION_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION create_log_partitions(start_ts timestamp, end_ts timestamp)
+    RETURNS void AS $$
+    DECLARE
+        week timestamp := date_trunc('week', start_ts);
+        partition_name text;
+    BEGIN
+        WHILE week < end_ts LOOP
+            partition_name := 'logs_p' || to_char(week, 'YYYYMMDD');
+            IF to_regclass(partition_name) IS NULL AND NOT EXISTS (
+                SELECT 1 FROM logs_default
+                WHERE timestamp >= week AND timestamp < week + interval '1 week'
+            ) THEN
+                EXECUTE format(
+                    'CREATE TABLE %%I PARTITION OF logs FOR VALUES FROM (%%L) TO (%%L)',
+                    partition_name, week, week + interval '1 week'
+                );
+            END IF;
+            week := week + interval '1 week';
+        END LOOP;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE TABLE IF NOT EXISTS logs_default PARTITION OF logs DEFAULT",
+    # The retention window and a few weeks ahead; the continuous logger keeps extending it
+    """
+    SELECT create_log_partitions(
+        (now() AT TIME ZONE 'UTC') - interval '2 weeks',
+        (now() AT TIME ZONE 'UTC') + interval '4 weeks'
     )
+    """,
+]
+
+for statement in PARTITION_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
+
+
+class LogHourly(Base):
+    """Log counts per hour, severity and source, maintained by triggers on logs"""
+    __tablename__ = "logs_hourly"
+
+    hour = Column(DateTime, primary_key=True)
+    severity = Column(Enum(SeverityEnum), primary_key=True)
+    source = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False)
+
+
+# Statement-level triggers read the affected rows from transition tables, so
+# bulk inserts and the cleanup DELETE update the rollup once per statement.
+# All statements are idempotent because create_all runs on every startup.
+ROLLUP_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION logs_hourly_rollup() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE logs_hourly h SET count = h.count - d.n
+            FROM (
+                SELECT to_timestamp(hour_bucket) AT TIME ZONE 'UTC' AS hour, severity, source, count(*) AS n
+                FROM old_rows GROUP BY hour_bucket, severity, source
+            ) d
+            WHERE h.hour = d.hour AND h.severity = d.severity AND h.source = d.source;
+
+            DELETE FROM logs_hourly
+            WHERE count <= 0
+              AND hour IN (SELECT DISTINCT to_timestamp(hour_bucket) AT TIME ZONE 'UTC' FROM old_rows);
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO logs_hourly (hour, severity, source, count)
+            SELECT to_timestamp(hour_bucket) AT TIME ZONE 'UTC', severity, source, count(*)
+            FROM new_rows GROUP BY hour_bucket, severity, source
+            ON CONFLICT (hour, severity, source)
+            DO UPDATE SET count = logs_hourly.count + EXCLUDED.count;
+        END IF;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER logs_hourly_insert AFTER INSERT ON logs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION logs_hourly_rollup()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER logs_hourly_update AFTER UPDATE ON logs
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION logs_hourly_rollup()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER logs_hourly_delete AFTER DELETE ON logs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION logs_hourly_rollup()
+    """,
+    # Backfill logs that existed before the rollup table did
+    """
+    INSERT INTO logs_hourly (hour, severity, source, count)
+    SELECT date_trunc('hour', timestamp), severity, source, count(*)
+    FROM logs
+    WHERE NOT EXISTS (SELECT 1 FROM logs_hourly)
+    GROUP BY 1, 2, 3
+    """,
+]
+
+for statement in ROLLUP_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement))
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from uuid import UUID
 from typing import Optional, List
@@ -32,6 +32,10 @@ class Log(LogBase):
         from_attributes = True
 
 
+# Columns logs can be sorted by
+SORT_FIELDS = ("timestamp", "severity", "source", "id")
+
+
 class LogFilter(BaseModel):
     """Query parameters for filtering logs"""
     severity: Optional[SeverityEnum] = None
@@ -43,12 +47,25 @@ class LogFilter(BaseModel):
     sort_order: str = Field("desc", description="Sort order: asc or desc")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(50, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from a previous page's next_cursor")
+    include_total: bool = Field(True, description="Count the matching logs for total and total_pages")
+
+    @field_validator("sort_by")
+    @classmethod
+    def validate_sort_by(cls, value):
+        """Only allow sorting by known columns"""
+        if value not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of: {', '.join(SORT_FIELDS)}")
+        return value
 
 
 class LogList(BaseModel):
     """Paginated log list response"""
     items: List[Log]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    has_next: bool = False
+    next_cursor: Optional[str] = None
@@ -5,6 +5,7 @@ Generates new logs every 1-5 seconds and cleans up old logs hourly
 import random
 import time
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, text
 from app.database import SessionLocal
 from app.models.log import Log, SeverityEnum
 
@@ -65,15 +66,20 @@ SOURCES = [
     "cache-service",
 ]
 
+SEVERITIES = list(SeverityEnum)
+SEVERITY_WEIGHTS = [10, 40, 20, 10, 5]  # DEBUG, INFO, WARNING, ERROR, CRITICAL
 
-def generate_single_log(db):
-    """Generate a single log entry with current timestamp"""
+
+# Buffered logs are written together every FLUSH_INTERVAL seconds, a few
+# iterations' worth at 1-5s per log. Analytics are already cached for 10s, so
+# the delay is of the same order as the dashboard's own staleness.
+FLUSH_INTERVAL = 10.0  # seconds
+
+
+def generate_single_log():
+    """Generate a single log entry with current timestamp, as an insert row"""
     # Random severity with weighted probabilities
-    severity = random.choices(
-        list(SeverityEnum),
-        weights=[10, 40, 20, 10, 5],  # DEBUG, INFO, WARNING, ERROR, CRITICAL
-        k=1
-    )[0]
+    severity = random.choices(SEVERITIES, weights=SEVERITY_WEIGHTS, k=1)[0]
 
     # Random message for the severity
     message = random.choice(LOG_MESSAGES[severity])
@@ -81,29 +87,72 @@ def generate_single_log(db):
     # Random source
     source = random.choice(SOURCES)
 
-    # Create log entry with current timestamp
-    log = Log(
-        timestamp=datetime.now(timezone.utc),
-        message=message,
-        severity=severity,
-        source=source
-    )
-    db.add(log)
+    return {
+        "timestamp": datetime.now(timezone.utc),
+        "message": message,
+        "severity": severity,
+        "source": source
+    }
+
+
+def flush_logs(db, rows):
+    """Insert buffered log rows in a single transaction"""
+    db.bulk_insert_mappings(Log, rows)
     db.commit()
 
 
 def clear_old_logs(db, days=7):
-    """Clear logs older than specified days"""
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-    deleted = db.query(Log).filter(Log.timestamp < cutoff_date).delete()
+    """
+    Clear logs older than specified days
+    Weekly partitions that are entirely older are dropped along with their
+    rollup rows; only the remainder in the oldest kept partition is deleted.
+    """
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
+
+    partitions = db.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'logs'::regclass AND c.relname LIKE 'logs\\_p%'
+    """)).scalars()
+    dropped = 0
+    for name in partitions:
+        week_start = datetime.strptime(name[len("logs_p"):], "%Y%m%d")
+        week_end = week_start + timedelta(weeks=1)
+        if week_end <= cutoff_date:
+            # Dropping a partition fires no DELETE triggers, so clear its rollup rows here
+            db.execute(text(f'DROP TABLE "{name}"'))
+            db.execute(
+                text("DELETE FROM logs_hourly WHERE hour >= :start AND hour < :end"),
+                {"start": week_start, "end": week_end}
+            )
+            dropped += 1
+
+    # Nothing is loaded in the session, so skip synchronizing its state
+    deleted = db.execute(
+        delete(Log).where(Log.timestamp < cutoff_date).execution_options(synchronize_session=False)
+    ).rowcount
     db.commit()
+    if dropped > 0:
+        print(f"Dropped {dropped} log partitions older than {days} days.")
     if deleted > 0:
         print(f"Cleared {deleted} logs older than {days} days.")
 
 
+def create_partitions(db, weeks_ahead=4):
+    """Make sure weekly log partitions exist for the coming weeks"""
+    now = datetime.utcnow()
+    db.execute(
+        text("SELECT create_log_partitions(:start, :end)"),
+        {"start": now, "end": now + timedelta(weeks=weeks_ahead)}
+    )
+    db.commit()
+
+
 if __name__ == "__main__":
-    db = SessionLocal()
-    last_cleared = time.time()
+    # Monotonic clock so wall-clock adjustments don't trigger or delay the cleanup
+    last_cleared = time.monotonic()
+    last_flush = time.monotonic()
+    buffer = []
 
     print("=== Starting continuous log generation ===")
     print("New log every 1-5 seconds, cleanup every hour")
@@ -111,18 +160,29 @@ if __name__ == "__main__":
     try:
         while True:
             try:
-                generate_single_log(db)
-                time.sleep(random.randint(1, 5))
+                buffer.append(generate_single_log())
+                # A session per batch, so no connection is held while sleeping
+                if time.monotonic() - last_flush >= FLUSH_INTERVAL:
+                    with SessionLocal() as db:
+                        flush_logs(db, buffer)
+                    buffer = []
+                    last_flush = time.monotonic()
 
-                # Cleanup old logs every hour
-                if time.time() - last_cleared >= 3600:
-                    clear_old_logs(db, days=7)
-                    last_cleared = time.time()
+                # Cleanup old logs and create upcoming partitions every hour
+                if time.monotonic() - last_cleared >= 3600:
+                    with SessionLocal() as db:
+                        clear_old_logs(db, days=7)
+                        create_partitions(db)
+                    last_cleared = time.monotonic()
             except Exception as e:
+                # Closing the session rolled back the failed transaction
                 print(f"Error generating log: {e}")
-                db.rollback()
                 time.sleep(1)  # Brief pause before retrying
+                continue
+
+            time.sleep(random.randint(1, 5))
     except KeyboardInterrupt:
         print("\n=== Stopping continuous log generation ===")
-    finally:
-        db.close()
+        if buffer:
+            with SessionLocal() as db:
+                flush_logs(db, buffer)
@@ -2,10 +2,13 @@
 Database seeding script
 Generates sample log data for testing and development
 """
+import csv
+import io
 import random
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
+from sqlalchemy import text
 from app.database import SessionLocal, init_db
-from app.models.log import Log, SeverityEnum
+from app.models.log import SeverityEnum
 from app.models.user import User
 from app.core.security import get_password_hash
 
@@ -66,6 +69,9 @@ SOURCES = [
     "cache-service",
 ]
 
+SEVERITIES = list(SeverityEnum)
+SEVERITY_WEIGHTS = [10, 40, 20, 10, 5]  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+
 def check_sample_user(db):
     """Check if sample user exists"""
     return db.query(User).filter(User.email == "admin@example.com").first() is not None
@@ -90,51 +96,77 @@ def create_sample_user(db):
     return user
 
 
-def generate_logs(db, count=100000, days=5):
+# id, created_at and updated_at are filled in by the database defaults
+COPY_COLUMNS = ["timestamp", "message", "severity", "source"]
+
+
+def insert_logs(db, rows):
+    """Load a batch of log rows with COPY in a single transaction"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            row["timestamp"].isoformat(),
+            row["message"],
+            row["severity"].value,
+            row["source"]
+        ])
+    buffer.seek(0)
+
+    # COPY streams the rows without parsing and planning an INSERT per row
+    cursor = db.connection().connection.cursor()
+    cursor.copy_expert(f"COPY logs ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    db.commit()
+
+
+def generate_logs(db, count=100000, days=5, batch_size=10000):
     """Generate historical log entries spread over specified days"""
     print(f"Generating {count} log entries over the last {days} days...")
 
     logs_created = 0
-    end_date = datetime.now(timezone.utc)
+    # Naive UTC like the column; COPY ignores the offset of aware timestamps
+    end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
 
-    for _ in range(count):
-        # Random timestamp within the date range
-        random_seconds = random.randint(0, int((end_date - start_date).total_seconds()))
-        timestamp = start_date + timedelta(seconds=random_seconds)
-
-        # Random severity with weighted probabilities
-        severity = random.choices(
-            list(SeverityEnum),
-            weights=[10, 40, 20, 10, 5],  # DEBUG, INFO, WARNING, ERROR, CRITICAL
-            k=1
-        )[0]
-
-        # Random message for the severity
-        message = random.choice(LOG_MESSAGES[severity])
-
-        # Random source
-        source = random.choice(SOURCES)
-
-        # Create log entry
-        log = Log(
-            timestamp=timestamp,
-            message=message,
-            severity=severity,
-            source=source
-        )
-        db.add(log)
-        logs_created += 1
-
-        # Commit in batches of 100 for performance
-        if logs_created % 100 == 0:
-            db.commit()
-            print(f"Created {logs_created}/{count} logs...")
-
-    # Final commit
-    db.commit()
+    # Random timestamps within the date range, sorted so rows are stored in
+    # time order and the BRIN index on timestamp stays tight
+    span = int((end_date - start_date).total_seconds())
+    offsets = sorted(random.choices(range(span + 1), k=count))
+
+    for batch_start in range(0, count, batch_size):
+        size = min(batch_size, count - batch_start)
+
+        # Sample whole columns at once; weights are only normalized once per batch
+        severities = random.choices(SEVERITIES, weights=SEVERITY_WEIGHTS, k=size)
+        sources = random.choices(SOURCES, k=size)
+
+        rows = []
+        for i in range(size):
+            timestamp = start_date + timedelta(seconds=offsets[batch_start + i])
+            severity = severities[i]
+
+            # Random message for the severity
+            message = random.choice(LOG_MESSAGES[severity])
+            source = sources[i]
+
+            rows.append({
+                "timestamp": timestamp,
+                "message": message,
+                "severity": severity,
+                "source": source
+            })
+
+        # Insert each batch in its own transaction
+        insert_logs(db, rows)
+        logs_created += len(rows)
+        print(f"Created {logs_created}/{count} logs...")
+
     print(f"Successfully created {logs_created} log entries!")
 
+    # Refresh planner statistics so the new indexes are used right away
+    db.execute(text("ANALYZE logs"))
+    db.commit()
+
 
 def seed_database():
     """Main seeding function"""
@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+
+from asyncpg.pgproto.pgproto import UUID as AsyncpgUUID
+
+from app.models.log import SeverityEnum
+
+
+def make_row(message="Database query timeout"):
+    """A list row as asyncpg returns it, in _LIST_COLUMNS order"""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return (
+        AsyncpgUUID(uuid.uuid4().bytes),
+        now,
+        message,
+        SeverityEnum.ERROR,
+        "database",
+        now,
+        now,
+    )
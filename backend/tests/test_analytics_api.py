@@ -0,0 +1,24 @@
+from app.core.dependencies import get_db
+from app.crud import log as log_crud
+from app.main import app
+
+
+class FakeSession:
+    """Returns fixed rows for any query"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt):
+        return iter(self.rows)
+
+
+def test_aggregated_without_matching_logs(client):
+    log_crud._analytics_cache.clear()
+    # GROUPING SETS still yields the () grand total row, with a NULL sum
+    app.dependency_overrides[get_db] = lambda: FakeSession([(None, None, None)])
+
+    response = client.get("/api/analytics/aggregated", params={"source": "nope"})
+
+    assert response.status_code == 200
+    assert response.json() == {"total_logs": 0, "by_severity": {}, "by_source": {}}
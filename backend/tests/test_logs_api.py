@@ -0,0 +1,115 @@
+import base64
+import uuid
+from datetime import datetime
+
+import orjson
+from sqlalchemy.sql import operators
+
+from app.api import logs as logs_api
+from app.core.dependencies import get_db
+from app.crud import log as log_crud
+from app.main import app
+from tests.helpers import make_row
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    async def partitions(self):
+        yield self.rows
+
+
+class FakeSession:
+    """Answers the unfiltered list queries with fixed rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def scalar(self, stmt):
+        # Planner row estimate for the unfiltered total
+        return len(self.rows)
+
+    async def execute(self, stmt):
+        return FakeResult(self.rows)
+
+    async def stream(self, stmt):
+        return FakeResult(self.rows)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class OrderingSession(FakeSession):
+    """Sorts and slices its rows as the database would for each statement"""
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.queries = 0
+
+    async def execute(self, stmt):
+        # Rows sharing the sort key come back in a different order every query
+        self.queries += 1
+        rows = list(self.rows) if self.queries % 2 else self.rows[::-1]
+        keys = [column.key for column in log_crud._LIST_COLUMNS]
+        # Stable sorts from the last ORDER BY key to the first
+        for clause in reversed(stmt._order_by_clauses):
+            index = keys.index(clause.element.key)
+            rows.sort(key=lambda row: str(row[index]), reverse=clause.modifier is operators.desc_op)
+        return FakeResult(rows[stmt._offset:stmt._offset + stmt._limit])
+
+
+def test_list_logs_returns_rows(client):
+    rows = [make_row(), make_row("Payment processing failed")]
+    app.dependency_overrides[get_db] = lambda: FakeSession(rows)
+
+    response = client.get("/api/logs")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [str(row[0]) for row in rows]
+    assert body["items"][0]["severity"] == "ERROR"
+    assert body["total"] == 2
+    assert body["has_next"] is False
+
+
+def test_export_ndjson_returns_rows(client, monkeypatch):
+    rows = [make_row(), make_row("Payment processing failed")]
+    monkeypatch.setattr(logs_api, "AsyncSessionLocal", lambda: FakeSession(rows))
+
+    response = client.get("/api/logs/export", params={"format": "ndjson"})
+
+    assert response.status_code == 200
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [line["id"] for line in lines] == [str(row[0]) for row in rows]
+    assert lines[1]["message"] == "Payment processing failed"
+
+
+def test_list_logs_pages_through_tied_timestamps(client):
+    # make_row gives every row the same timestamp
+    rows = [make_row(f"Message {i}") for i in range(5)]
+    app.dependency_overrides[get_db] = lambda: OrderingSession(rows)
+
+    ids = []
+    for page in (1, 2, 3):
+        response = client.get("/api/logs", params={"page": page, "page_size": 2})
+        assert response.status_code == 200
+        ids += [item["id"] for item in response.json()["items"]]
+
+    # Ties are broken on id, so no row is skipped or repeated across pages
+    assert ids == sorted((str(row[0]) for row in rows), reverse=True)
+
+
+def test_decode_cursor_with_offset_is_naive_utc():
+    raw = f"2024-01-01T14:00:00+02:00|{uuid.uuid4()}"
+    cursor = base64.urlsafe_b64encode(raw.encode()).decode()
+
+    timestamp, _ = log_crud.decode_cursor(cursor)
+
+    assert timestamp == datetime(2024, 1, 1, 12, 0, 0)
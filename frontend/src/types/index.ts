@@ -34,14 +34,19 @@ export interface LogFilters {
   sort_order?: 'asc' | 'desc'
   page?: number
   page_size?: number
+  cursor?: string
+  include_total?: boolean
 }
 
 export interface LogListResponse {
   items: Log[]
-  total: number
+  total: number | null
+  total_is_estimate: boolean
   page: number
   page_size: number
-  total_pages: number
+  total_pages: number | null
+  has_next: boolean
+  next_cursor?: string | null
 }
 
 export interface AggregatedData {